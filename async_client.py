@@ -0,0 +1,218 @@
+"""
+Async Binance Futures Testnet Client
+Non-blocking counterpart of BinanceFuturesClient for issuing concurrent requests
+"""
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, Dict, List, Optional
+import aiohttp
+import orjson
+from binance import AsyncClient
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+from binance_client import _create_futures_v3_uri, _format_decimal
+from config import Config
+
+class EventLoopThread:
+    """Runs coroutines on a dedicated, long-lived event loop thread"""
+    
+    def __init__(self):
+        """Start the event loop in a background thread"""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="async-client-loop",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def run(self, coro: Coroutine) -> Any:
+        """Run a coroutine on the loop and block until it completes"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
+    def stop(self):
+        """Stop the loop and wait for the thread to exit"""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+class _OrjsonAsyncClient(AsyncClient):
+    """python-binance async client that decodes REST responses with orjson"""
+    
+    async def _handle_response(self, response: aiohttp.ClientResponse):
+        """Raise on HTTP errors, otherwise decode the response body"""
+        if not 200 <= response.status < 300:
+            raise BinanceAPIException(response, response.status, await response.text())
+        try:
+            return orjson.loads(await response.read())
+        except orjson.JSONDecodeError:
+            raise BinanceRequestException(f"Invalid Response: {await response.text()}")
+
+class BinanceFuturesAsyncClient:
+    """Async client for interacting with Binance Futures Testnet"""
+    
+    def __init__(self, client: AsyncClient):
+        """Wrap an already connected python-binance AsyncClient"""
+        self.client = client
+        self.logger = logging.getLogger(__name__)
+        
+        # v3 positionRisk only returns symbols with a position or open orders
+        self._position_risk_url = _create_futures_v3_uri(client, 'positionRisk')
+    
+    @classmethod
+    async def create(cls) -> 'BinanceFuturesAsyncClient':
+        """Create a client backed by one pooled keep-alive aiohttp session"""
+        connector = aiohttp.TCPConnector(limit=Config.HTTP_POOL_SIZE)
+        client = await _OrjsonAsyncClient.create(
+            api_key=Config.BINANCE_API_KEY,
+            api_secret=Config.BINANCE_SECRET_KEY,
+            testnet=True,
+            session_params={'connector': connector}
+        )
+        return cls(client)
+    
+    async def close(self):
+        """Close the underlying HTTP session"""
+        await self.client.close_connection()
+    
+    async def get_account_info(self) -> Dict:
+        """Get account information"""
+        try:
+            account_info = await self.client.futures_account()
+            return {
+                'total_wallet_balance': account_info.get('totalWalletBalance'),
+                'total_unrealized_pnl': account_info.get('totalUnrealizedProfit'),
+                'total_margin_balance': account_info.get('totalMarginBalance'),
+                'available_balance': account_info.get('availableBalance'),
+                'max_withdraw_amount': account_info.get('maxWithdrawAmount')
+            }
+        except Exception as e:
+            self.logger.error("Failed to get account info: %s", e)
+            raise
+    
+    async def get_current_price(self, symbol: str) -> float:
+        """Get current price for a symbol"""
+        try:
+            ticker = await self.client.futures_symbol_ticker(symbol=symbol)
+            return float(ticker['price'])
+        except Exception as e:
+            self.logger.error("Failed to get current price for %s: %s", symbol, e)
+            raise
+    
+    async def get_order_book(self, symbol: str, limit: int = 100) -> Dict:
+        """Get order book for a symbol"""
+        try:
+            return await self.client.futures_order_book(symbol=symbol, limit=limit)
+        except Exception as e:
+            self.logger.error("Failed to get order book for %s: %s", symbol, e)
+            raise
+    
+    async def place_market_order(self, symbol: str, side: str, quantity: float,
+                                 reduce_only: bool = False) -> Dict:
+        """Place a market order"""
+        try:
+            self.logger.info("Placing market %s order for %s %s", side, quantity, symbol)
+            
+            order = await self.client.futures_create_order(
+                symbol=symbol,
+                side=side,
+                type='MARKET',
+                quantity=_format_decimal(quantity),
+                reduceOnly=reduce_only
+            )
+            
+            self.logger.info("Market order placed successfully: %s", order.get('orderId'))
+            return order
+        
+        except BinanceAPIException as e:
+            self.logger.error("Binance API error placing market order: %s", e)
+            raise
+        except Exception as e:
+            self.logger.error("Unexpected error placing market order: %s", e)
+            raise
+    
+    async def place_limit_order(self, symbol: str, side: str, quantity: float,
+                                price: float, time_in_force: str = 'GTC',
+                                reduce_only: bool = False) -> Dict:
+        """Place a limit order"""
+        try:
+            self.logger.info("Placing limit %s order for %s %s at %s", side, quantity, symbol, price)
+            
+            order = await self.client.futures_create_order(
+                symbol=symbol,
+                side=side,
+                type='LIMIT',
+                quantity=_format_decimal(quantity),
+                price=_format_decimal(price),
+                timeInForce=time_in_force,
+                reduceOnly=reduce_only
+            )
+            
+            self.logger.info("Limit order placed successfully: %s", order.get('orderId'))
+            return order
+        
+        except BinanceAPIException as e:
+            self.logger.error("Binance API error placing limit order: %s", e)
+            raise
+        except Exception as e:
+            self.logger.error("Unexpected error placing limit order: %s", e)
+            raise
+    
+    async def cancel_order(self, symbol: str, order_id: int) -> Dict:
+        """Cancel an order"""
+        try:
+            self.logger.info("Cancelling order %s for %s", order_id, symbol)
+            
+            result = await self.client.futures_cancel_order(
+                symbol=symbol,
+                orderId=order_id
+            )
+            
+            self.logger.info("Order %s cancelled successfully", order_id)
+            return result
+        
+        except Exception as e:
+            self.logger.error("Error cancelling order: %s", e)
+            raise
+    
+    async def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict]:
+        """Get open orders"""
+        try:
+            if symbol:
+                return await self.client.futures_get_open_orders(symbol=symbol)
+            return await self.client.futures_get_open_orders()
+        except Exception as e:
+            self.logger.error("Error getting open orders: %s", e)
+            raise
+    
+    async def _fetch_position_risk(self, params: Dict) -> List[Dict]:
+        """
+        Fetch position risk rows, skipping flat symbols on the exchange side
+        
+        Mirrors BinanceFuturesClient._fetch_position_risk, falling back to v2
+        for good if v3 is missing.
+        """
+        if self._position_risk_url:
+            try:
+                return await self.client._request('get', self._position_risk_url, True, True,
+                                                  data=dict(params))
+            except BinanceAPIException as e:
+                if e.status_code != 404:
+                    raise
+                self.logger.info("v3 positionRisk unavailable, falling back to v2")
+                self._position_risk_url = None
+        
+        return await self.client.futures_position_information(**params)
+    
+    async def get_positions(self, symbol: Optional[str] = None) -> List[Dict]:
+        """Get current positions"""
+        try:
+            params = {'symbol': symbol} if symbol else {}
+            positions = await self._fetch_position_risk(params)
+            
+            # Symbols with only open orders still report a zero size
+            return [pos for pos in positions if float(pos['positionAmt'])]
+        
+        except Exception as e:
+            self.logger.error("Error getting positions: %s", e)
+            raise
@@ -2,12 +2,47 @@
 Binance Futures Testnet Client
 Handles all API interactions with Binance Futures Testnet
 """
+import hashlib
+import hmac
 import logging
 import time
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 from binance.client import Client
-from binance.exceptions import BinanceAPIException, BinanceOrderException
+from binance.exceptions import BinanceAPIException, BinanceOrderException, BinanceRequestException
 from config import Config
+from market_data import MarketDataStream
+
+def _format_decimal(value: float) -> str:
+    """Format a number in plain decimal notation (never scientific)"""
+    return format(Decimal(str(value)), 'f')
+
+def _create_futures_v3_uri(client, path: str) -> str:
+    """
+    Build a /fapi/v3 URI for a python-binance sync or async client
+    
+    Mirrors Client._create_futures_api_uri, which only knows v1 and v2.
+    """
+    url = client.FUTURES_TESTNET_URL if client.testnet else client.FUTURES_URL
+    return f"{url}/v3/{path}"
+
+class _OrjsonClient(Client):
+    """python-binance client that decodes REST responses with orjson"""
+    
+    @staticmethod
+    def _handle_response(response: requests.Response):
+        """Raise on HTTP errors, otherwise decode the response body"""
+        if not (200 <= response.status_code < 300):
+            raise BinanceAPIException(response, response.status_code, response.text)
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            raise BinanceRequestException(f"Invalid Response: {response.text}")
 
 class BinanceFuturesClient:
     """Client for interacting with Binance Futures Testnet"""
@@ -15,6 +50,20 @@ class BinanceFuturesClient:
     def __init__(self):
         """Initialize the Binance client"""
         self.client = None
+        self.market_data: Optional[MarketDataStream] = None
+        
+        # Exchange info cache with a symbol -> info index
+        self._exchange_info_cache: Optional[Dict] = None
+        self._exchange_info_ts = 0.0
+        self._symbol_index: Dict[str, Dict] = {}
+        
+        # Pre-signed order templates keyed by their fixed parameters
+        self._order_templates: Dict[Tuple, Callable[..., str]] = {}
+        self._order_url = None
+        
+        # v3 positionRisk only returns symbols with a position or open orders
+        self._position_risk_url = None
+        
         self.logger = logging.getLogger(__name__)
         self._initialize_client()
     
@@ -22,55 +71,218 @@ class BinanceFuturesClient:
         """Initialize the Binance client with testnet configuration"""
         try:
             # Initialize client with testnet configuration
-            self.client = Client(
+            self.client = _OrjsonClient(
                 api_key=Config.BINANCE_API_KEY,
                 api_secret=Config.BINANCE_SECRET_KEY,
                 testnet=True  # This ensures we use the testnet
             )
             
-            # Test the connection
-            account_info = self.client.futures_account()
+            # Reuse one pooled keep-alive session for the lifetime of the bot
+            default_session = self.client.session
+            self.client.session = self._create_session(default_session.headers)
+            default_session.close()
+            
+            self._order_url = self.client._create_futures_api_uri('order')
+            self._position_risk_url = _create_futures_v3_uri(self.client, 'positionRisk')
+            
+            # Test the connection while warming the exchange info cache
+            account_info = self.warmup()
             self.logger.info("Successfully connected to Binance Futures Testnet")
-            self.logger.info(f"Account balance: {account_info.get('totalWalletBalance', 'N/A')} USDT")
+            self.logger.info("Account balance: %s USDT", account_info.get('totalWalletBalance', 'N/A'))
             
         except Exception as e:
-            self.logger.error(f"Failed to initialize Binance client: {str(e)}")
+            self.logger.error("Failed to initialize Binance client: %s", e)
             raise
     
+    @staticmethod
+    def _create_session(headers: Dict) -> requests.Session:
+        """Create a requests session with a tuned keep-alive connection pool"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=Config.HTTP_POOL_SIZE,
+            pool_maxsize=Config.HTTP_POOL_SIZE,
+            max_retries=0
+        )
+        session.mount("https://", adapter)
+        
+        # Keep the API key and default headers set up by python-binance
+        session.headers.update(headers)
+        session.headers.update({"Connection": "keep-alive"})
+        return session
+    
+    def _get_order_template(self, symbol: str, side: str, order_type: str,
+                            time_in_force: Optional[str] = None,
+                            reduce_only: bool = False) -> Callable[..., str]:
+        """
+        Get the signer for orders sharing symbol, side, type and flags
+        
+        The fixed parameters are serialized and fed to the HMAC once; each
+        order then copies that HMAC state and only hashes the quantity,
+        price and timestamp appended to it.
+        """
+        key = (symbol, side, order_type, time_in_force, reduce_only)
+        template = self._order_templates.get(key)
+        if template is not None:
+            return template
+        
+        fixed_params = {'symbol': symbol, 'side': side, 'type': order_type}
+        if time_in_force:
+            fixed_params['timeInForce'] = time_in_force
+        fixed_params['reduceOnly'] = 'true' if reduce_only else 'false'
+        head = urlencode(fixed_params)
+        signed_head = hmac.new(self.client.API_SECRET.encode(), head.encode(), hashlib.sha256)
+        
+        def sign(quantity: float, price: Optional[float] = None) -> str:
+            tail = f"&quantity={_format_decimal(quantity)}"
+            if price is not None:
+                tail += f"&price={_format_decimal(price)}"
+            tail += f"&timestamp={int(time.time() * 1000 + self.client.timestamp_offset)}"
+            
+            mac = signed_head.copy()
+            mac.update(tail.encode())
+            return f"{head}{tail}&signature={mac.hexdigest()}"
+        
+        self._order_templates[key] = sign
+        return sign
+    
+    def _send_order(self, query: str) -> Dict:
+        """POST a signed order query string to the order endpoint"""
+        response = self.client.session.post(
+            f"{self._order_url}?{query}",
+            timeout=self.client.REQUEST_TIMEOUT
+        )
+        return self.client._handle_response(response)
+    
+    @staticmethod
+    def _summarize_account(account_info: Dict) -> Dict:
+        """Pick the balance fields shown to the user from a raw account response"""
+        return {
+            'total_wallet_balance': account_info.get('totalWalletBalance'),
+            'total_unrealized_pnl': account_info.get('totalUnrealizedProfit'),
+            'total_margin_balance': account_info.get('totalMarginBalance'),
+            'available_balance': account_info.get('availableBalance'),
+            'max_withdraw_amount': account_info.get('maxWithdrawAmount')
+        }
+    
     def get_account_info(self) -> Dict:
         """Get account information"""
+        try:
+            return self._summarize_account(self.client.futures_account())
+        except Exception as e:
+            self.logger.error("Failed to get account info: %s", e)
+            raise
+    
+    def get_account_snapshot(self) -> Dict:
+        """
+        Get account information and open positions from a single account request
+        
+        Returns:
+            {'account': <as get_account_info>, 'positions': <as get_positions>}.
+            The account endpoint has no mark price, so it is derived from the
+            entry price and unrealized profit and rounded to the symbol's
+            price precision.
+        """
         try:
             account_info = self.client.futures_account()
-            return {
-                'total_wallet_balance': account_info.get('totalWalletBalance'),
-                'total_unrealized_pnl': account_info.get('totalUnrealizedProfit'),
-                'total_margin_balance': account_info.get('totalMarginBalance'),
-                'available_balance': account_info.get('availableBalance'),
-                'max_withdraw_amount': account_info.get('maxWithdrawAmount')
-            }
+            
+            positions = []
+            for pos in account_info.get('positions', ()):
+                amount = float(pos['positionAmt'])
+                if not amount:
+                    continue
+                mark_price = float(pos['entryPrice']) + float(pos['unrealizedProfit']) / amount
+                symbol_info = self._symbol_index.get(pos['symbol'])
+                precision = symbol_info['pricePrecision'] if symbol_info else 8
+                positions.append({
+                    **pos,
+                    'markPrice': "%.*f" % (precision, mark_price),
+                    'unRealizedProfit': pos['unrealizedProfit']
+                })
+            
+            return {'account': self._summarize_account(account_info), 'positions': positions}
         except Exception as e:
-            self.logger.error(f"Failed to get account info: {str(e)}")
+            self.logger.error("Failed to get account snapshot: %s", e)
+            raise
+    
+    def warmup(self) -> Dict:
+        """
+        Fetch account and exchange info concurrently
+        
+        Returns the raw account info; the exchange info is stored in the cache.
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            account_future = executor.submit(self.client.futures_account)
+            exchange_info_future = executor.submit(self.client.futures_exchange_info)
+            account_info = account_future.result()
+            self._store_exchange_info(exchange_info_future.result())
+        
+        return account_info
+    
+    def _store_exchange_info(self, exchange_info: Dict):
+        """Cache exchange info and rebuild the symbol index"""
+        self._symbol_index = {s['symbol']: s for s in exchange_info['symbols']}
+        self._exchange_info_cache = exchange_info
+        self._exchange_info_ts = time.monotonic()
+    
+    def get_exchange_info(self, ttl: float = Config.EXCHANGE_INFO_TTL) -> Dict:
+        """Get exchange information, refreshing the cached copy once older than ttl seconds"""
+        try:
+            if (self._exchange_info_cache is None
+                    or time.monotonic() - self._exchange_info_ts > ttl):
+                self._store_exchange_info(self.client.futures_exchange_info())
+            
+            return self._exchange_info_cache
+        except Exception as e:
+            self.logger.error("Failed to get exchange info: %s", e)
             raise
     
     def get_symbol_info(self, symbol: str) -> Dict:
         """Get symbol information"""
         try:
-            exchange_info = self.client.futures_exchange_info()
-            for symbol_info in exchange_info['symbols']:
-                if symbol_info['symbol'] == symbol:
-                    return symbol_info
-            raise ValueError(f"Symbol {symbol} not found")
+            symbol_info = self._lookup_symbol(symbol)
+            if symbol_info is None:
+                raise ValueError(f"Symbol {symbol} not found")
+            return symbol_info
         except Exception as e:
-            self.logger.error(f"Failed to get symbol info for {symbol}: {str(e)}")
+            self.logger.error("Failed to get symbol info for %s: %s", symbol, e)
             raise
     
+    def is_symbol_tradeable(self, symbol: str) -> bool:
+        """Check whether a symbol is listed and trading, using the cached exchange info"""
+        symbol_info = self._lookup_symbol(symbol)
+        return symbol_info is not None and symbol_info['status'] == 'TRADING'
+    
+    def _lookup_symbol(self, symbol: str) -> Optional[Dict]:
+        """Look up a symbol in the cached index, refreshing it early on a miss"""
+        self.get_exchange_info()
+        symbol_info = self._symbol_index.get(symbol)
+        
+        if symbol_info is None:
+            # The symbol may have been listed since the last refresh
+            self.get_exchange_info(ttl=Config.EXCHANGE_INFO_MISS_TTL)
+            symbol_info = self._symbol_index.get(symbol)
+        
+        return symbol_info
+    
     def get_current_price(self, symbol: str) -> float:
         """Get current price for a symbol"""
         try:
+            # Serve from the streamed cache, falling back to REST on a miss
+            market_data = self.market_data
+            if market_data is not None:
+                price = market_data.get_price(symbol)
+                if price is not None:
+                    return price
+            
             ticker = self.client.futures_symbol_ticker(symbol=symbol)
+            
+            # Only stream symbols the exchange has just confirmed exist
+            if market_data is not None:
+                market_data.subscribe(symbol)
+            
             return float(ticker['price'])
         except Exception as e:
-            self.logger.error(f"Failed to get current price for {symbol}: {str(e)}")
+            self.logger.error("Failed to get current price for %s: %s", symbol, e)
             raise
     
     def get_order_book(self, symbol: str, limit: int = 100) -> Dict:
@@ -79,7 +291,7 @@ class BinanceFuturesClient:
             order_book = self.client.futures_order_book(symbol=symbol, limit=limit)
             return order_book
         except Exception as e:
-            self.logger.error(f"Failed to get order book for {symbol}: {str(e)}")
+            self.logger.error("Failed to get order book for %s: %s", symbol, e)
             raise
     
     def place_market_order(self, symbol: str, side: str, quantity: float, 
@@ -94,24 +306,21 @@ class BinanceFuturesClient:
             reduce_only: Whether this is a reduce-only order
         """
         try:
-            self.logger.info(f"Placing market {side} order for {quantity} {symbol}")
+            self.logger.info("Placing market %s order for %s %s", side, quantity, symbol)
             
-            order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side,
-                type='MARKET',
-                quantity=quantity,
-                reduceOnly=reduce_only
-            )
+            sign = self._get_order_template(symbol, side, 'MARKET', reduce_only=reduce_only)
+            order = self._send_order(sign(quantity))
             
-            self.logger.info(f"Market order placed successfully: {order}")
+            self.logger.info("Market order placed successfully: %s", order.get('orderId'))
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Order response: %s", order)
             return order
             
         except BinanceAPIException as e:
-            self.logger.error(f"Binance API error placing market order: {e}")
+            self.logger.error("Binance API error placing market order: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error placing market order: {str(e)}")
+            self.logger.error("Unexpected error placing market order: %s", e)
             raise
     
     def place_limit_order(self, symbol: str, side: str, quantity: float, 
@@ -129,26 +338,21 @@ class BinanceFuturesClient:
             reduce_only: Whether this is a reduce-only order
         """
         try:
-            self.logger.info(f"Placing limit {side} order for {quantity} {symbol} at {price}")
+            self.logger.info("Placing limit %s order for %s %s at %s", side, quantity, symbol, price)
             
-            order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side,
-                type='LIMIT',
-                quantity=quantity,
-                price=price,
-                timeInForce=time_in_force,
-                reduceOnly=reduce_only
-            )
+            sign = self._get_order_template(symbol, side, 'LIMIT', time_in_force, reduce_only)
+            order = self._send_order(sign(quantity, price))
             
-            self.logger.info(f"Limit order placed successfully: {order}")
+            self.logger.info("Limit order placed successfully: %s", order.get('orderId'))
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Order response: %s", order)
             return order
             
         except BinanceAPIException as e:
-            self.logger.error(f"Binance API error placing limit order: {e}")
+            self.logger.error("Binance API error placing limit order: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error placing limit order: {str(e)}")
+            self.logger.error("Unexpected error placing limit order: %s", e)
             raise
     
     def place_stop_limit_order(self, symbol: str, side: str, quantity: float,
@@ -166,7 +370,7 @@ class BinanceFuturesClient:
             time_in_force: Time in force
         """
         try:
-            self.logger.info(f"Placing stop-limit {side} order for {quantity} {symbol}")
+            self.logger.info("Placing stop-limit %s order for %s %s", side, quantity, symbol)
             
             order = self.client.futures_create_order(
                 symbol=symbol,
@@ -177,28 +381,32 @@ class BinanceFuturesClient:
                 timeInForce=time_in_force
             )
             
-            self.logger.info(f"Stop-limit order placed successfully: {order}")
+            self.logger.info("Stop-limit order placed successfully: %s", order.get('orderId'))
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Order response: %s", order)
             return order
             
         except Exception as e:
-            self.logger.error(f"Error placing stop-limit order: {str(e)}")
+            self.logger.error("Error placing stop-limit order: %s", e)
             raise
     
     def cancel_order(self, symbol: str, order_id: int) -> Dict:
         """Cancel an order"""
         try:
-            self.logger.info(f"Cancelling order {order_id} for {symbol}")
+            self.logger.info("Cancelling order %s for %s", order_id, symbol)
             
             result = self.client.futures_cancel_order(
                 symbol=symbol,
                 orderId=order_id
             )
             
-            self.logger.info(f"Order cancelled successfully: {result}")
+            self.logger.info("Order %s cancelled successfully", order_id)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Cancel response: %s", result)
             return result
             
         except Exception as e:
-            self.logger.error(f"Error cancelling order: {str(e)}")
+            self.logger.error("Error cancelling order: %s", e)
             raise
     
     def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict]:
@@ -212,7 +420,7 @@ class BinanceFuturesClient:
             return orders
             
         except Exception as e:
-            self.logger.error(f"Error getting open orders: {str(e)}")
+            self.logger.error("Error getting open orders: %s", e)
             raise
     
     def get_order_history(self, symbol: str, limit: int = 100) -> List[Dict]:
@@ -225,22 +433,39 @@ class BinanceFuturesClient:
             return orders
             
         except Exception as e:
-            self.logger.error(f"Error getting order history: {str(e)}")
+            self.logger.error("Error getting order history: %s", e)
             raise
     
+    def _fetch_position_risk(self, params: Dict) -> List[Dict]:
+        """
+        Fetch position risk rows, skipping flat symbols on the exchange side
+        
+        v2 returns a row for every symbol; v3 only returns symbols with a
+        position or open orders. Falls back to v2 for good if v3 is missing.
+        """
+        if self._position_risk_url:
+            try:
+                return self.client._request('get', self._position_risk_url, True, True, data=dict(params))
+            except BinanceAPIException as e:
+                if e.status_code != 404:
+                    raise
+                self.logger.info("v3 positionRisk unavailable, falling back to v2")
+                self._position_risk_url = None
+        
+        return self.client.futures_position_information(**params)
+    
     def get_positions(self, symbol: Optional[str] = None) -> List[Dict]:
         """Get current positions"""
         try:
-            positions = self.client.futures_position_information()
-            
-            if symbol:
-                positions = [pos for pos in positions if pos['symbol'] == symbol]
+            # Let the exchange filter by symbol instead of returning every market
+            params = {'symbol': symbol} if symbol else {}
+            positions = self._fetch_position_risk(params)
             
-            # Filter out positions with zero size
-            active_positions = [pos for pos in positions if float(pos['positionAmt']) != 0]
+            # Symbols with only open orders still report a zero size
+            active_positions = [pos for pos in positions if float(pos['positionAmt'])]
             
             return active_positions
             
         except Exception as e:
-            self.logger.error(f"Error getting positions: {str(e)}")
+            self.logger.error("Error getting positions: %s", e)
             raise
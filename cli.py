@@ -1,9 +1,10 @@
 """
 Command Line Interface for the Trading Bot
 """
+import asyncio
 import sys
 import logging
-from typing import Optional
+from typing import Dict, Optional
 from colorama import init, Fore, Style
 from tabulate import tabulate
 from trading_bot import TradingBot
@@ -12,6 +13,32 @@ from config import Config
 # Initialize colorama for colored output
 init(autoreset=True)
 
+# Use uvloop for the bot's event loops (async client, websockets) when available
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# Argument name -> (converter, message shown when conversion fails)
+ARG_SPECS = {
+    'symbol': (str.upper, "Invalid symbol."),
+    'quantity': (float, "Invalid quantity. Please enter a number."),
+    'price': (float, "Invalid price. Please enter a number."),
+    'order_id': (int, "Invalid order ID. Please enter a number.")
+}
+
+# Command -> ordered names of the arguments it requires
+COMMAND_ARGS = {
+    'price': ('symbol',),
+    'history': ('symbol',),
+    'buy_market': ('symbol', 'quantity'),
+    'sell_market': ('symbol', 'quantity'),
+    'buy_limit': ('symbol', 'quantity', 'price'),
+    'sell_limit': ('symbol', 'quantity', 'price'),
+    'cancel': ('symbol', 'order_id')
+}
+
 class TradingBotCLI:
     """Command Line Interface for the Trading Bot"""
     
@@ -20,6 +47,25 @@ class TradingBotCLI:
         self.bot = TradingBot()
         self.logger = logging.getLogger(__name__)
         
+        # Command name -> handler, built once so dispatch is a single lookup
+        self._handlers = {
+            'help': self.handle_help,
+            'info': self.handle_info,
+            'positions': self.handle_positions,
+            'orders': self.handle_orders,
+            'price': self.handle_price,
+            'buy_market': self.handle_buy_market,
+            'sell_market': self.handle_sell_market,
+            'buy_limit': self.handle_buy_limit,
+            'sell_limit': self.handle_sell_limit,
+            'cancel': self.handle_cancel,
+            'history': self.handle_history,
+            'symbols': self.handle_symbols,
+            'performance': self.handle_performance,
+            'start': self.handle_start,
+            'stop': self.handle_stop
+        }
+        
     def display_welcome(self):
         """Display welcome message"""
         print(f"{Fore.CYAN}{'='*60}")
@@ -67,6 +113,10 @@ class TradingBotCLI:
         
         return cmd, args
     
+    def handle_help(self, args: list):
+        """Handle help command"""
+        self.display_help()
+    
     def handle_info(self, args: list):
         """Handle info command"""
         self.bot.display_account_info()
@@ -80,13 +130,44 @@ class TradingBotCLI:
         symbol = args[0] if args else None
         self.bot.display_open_orders(symbol)
     
+    def parse_args(self, cmd: str, args: list) -> Optional[Dict]:
+        """Convert command arguments according to COMMAND_ARGS, or None if invalid"""
+        names = COMMAND_ARGS[cmd]
+        if len(args) < len(names):
+            usage = " ".join(f"<{name}>" for name in names)
+            print(f"{Fore.RED}❌ Usage: {cmd} {usage}")
+            return None
+        
+        params = {}
+        for name, value in zip(names, args):
+            converter, error_message = ARG_SPECS[name]
+            try:
+                params[name] = converter(value)
+            except ValueError:
+                print(f"{Fore.RED}❌ {error_message}")
+                return None
+        
+        return params
+    
+    def parse_order_args(self, cmd: str, args: list) -> Optional[Dict]:
+        """Parse order command arguments and check the symbol is tradeable"""
+        params = self.parse_args(cmd, args)
+        if params is None:
+            return None
+        
+        if not self.bot.validate_symbol(params['symbol']):
+            print(f"{Fore.RED}❌ Invalid or non-tradeable symbol: {params['symbol']}")
+            return None
+        
+        return params
+    
     def handle_price(self, args: list):
         """Handle price command"""
-        if not args:
-            print(f"{Fore.RED}❌ Please provide a symbol. Usage: price <symbol>")
+        params = self.parse_args('price', args)
+        if params is None:
             return
         
-        symbol = args[0].upper()
+        symbol = params['symbol']
         
         try:
             price = self.bot.get_current_price(symbol)
@@ -96,104 +177,41 @@ class TradingBotCLI:
     
     def handle_buy_market(self, args: list):
         """Handle market buy order"""
-        if len(args) < 2:
-            print(f"{Fore.RED}❌ Usage: buy_market <symbol> <quantity>")
-            return
-        
-        symbol = args[0].upper()
-        try:
-            quantity = float(args[1])
-        except ValueError:
-            print(f"{Fore.RED}❌ Invalid quantity. Please enter a number.")
-            return
-        
-        if not self.bot.validate_symbol(symbol):
-            print(f"{Fore.RED}❌ Invalid or non-tradeable symbol: {symbol}")
-            return
-        
-        self.bot.place_market_order(symbol, "BUY", quantity)
+        params = self.parse_order_args('buy_market', args)
+        if params:
+            self.bot.place_market_order(params['symbol'], "BUY", params['quantity'])
     
     def handle_sell_market(self, args: list):
         """Handle market sell order"""
-        if len(args) < 2:
-            print(f"{Fore.RED}❌ Usage: sell_market <symbol> <quantity>")
-            return
-        
-        symbol = args[0].upper()
-        try:
-            quantity = float(args[1])
-        except ValueError:
-            print(f"{Fore.RED}❌ Invalid quantity. Please enter a number.")
-            return
-        
-        if not self.bot.validate_symbol(symbol):
-            print(f"{Fore.RED}❌ Invalid or non-tradeable symbol: {symbol}")
-            return
-        
-        self.bot.place_market_order(symbol, "SELL", quantity)
+        params = self.parse_order_args('sell_market', args)
+        if params:
+            self.bot.place_market_order(params['symbol'], "SELL", params['quantity'])
     
     def handle_buy_limit(self, args: list):
         """Handle limit buy order"""
-        if len(args) < 3:
-            print(f"{Fore.RED}❌ Usage: buy_limit <symbol> <quantity> <price>")
-            return
-        
-        symbol = args[0].upper()
-        try:
-            quantity = float(args[1])
-            price = float(args[2])
-        except ValueError:
-            print(f"{Fore.RED}❌ Invalid quantity or price. Please enter numbers.")
-            return
-        
-        if not self.bot.validate_symbol(symbol):
-            print(f"{Fore.RED}❌ Invalid or non-tradeable symbol: {symbol}")
-            return
-        
-        self.bot.place_limit_order(symbol, "BUY", quantity, price)
+        params = self.parse_order_args('buy_limit', args)
+        if params:
+            self.bot.place_limit_order(params['symbol'], "BUY", params['quantity'], params['price'])
     
     def handle_sell_limit(self, args: list):
         """Handle limit sell order"""
-        if len(args) < 3:
-            print(f"{Fore.RED}❌ Usage: sell_limit <symbol> <quantity> <price>")
-            return
-        
-        symbol = args[0].upper()
-        try:
-            quantity = float(args[1])
-            price = float(args[2])
-        except ValueError:
-            print(f"{Fore.RED}❌ Invalid quantity or price. Please enter numbers.")
-            return
-        
-        if not self.bot.validate_symbol(symbol):
-            print(f"{Fore.RED}❌ Invalid or non-tradeable symbol: {symbol}")
-            return
-        
-        self.bot.place_limit_order(symbol, "SELL", quantity, price)
+        params = self.parse_order_args('sell_limit', args)
+        if params:
+            self.bot.place_limit_order(params['symbol'], "SELL", params['quantity'], params['price'])
     
     def handle_cancel(self, args: list):
         """Handle cancel order command"""
-        if len(args) < 2:
-            print(f"{Fore.RED}❌ Usage: cancel <symbol> <order_id>")
-            return
-        
-        symbol = args[0].upper()
-        try:
-            order_id = int(args[1])
-        except ValueError:
-            print(f"{Fore.RED}❌ Invalid order ID. Please enter a number.")
-            return
-        
-        self.bot.cancel_order(symbol, order_id)
+        params = self.parse_args('cancel', args)
+        if params:
+            self.bot.cancel_order(params['symbol'], params['order_id'])
     
     def handle_history(self, args: list):
         """Handle order history command"""
-        if not args:
-            print(f"{Fore.RED}❌ Please provide a symbol. Usage: history <symbol>")
+        params = self.parse_args('history', args)
+        if params is None:
             return
         
-        symbol = args[0].upper()
+        symbol = params['symbol']
         
         try:
             orders = self.bot.client.get_order_history(symbol, limit=20)
@@ -223,19 +241,17 @@ class TradingBotCLI:
     def handle_symbols(self, args: list):
         """Handle symbols command"""
         try:
-            exchange_info = self.bot.client.client.futures_exchange_info()
+            exchange_info = self.bot.client.get_exchange_info()
             symbols = [s['symbol'] for s in exchange_info['symbols'] 
                       if s['status'] == 'TRADING']
             
             print(f"\n{Fore.GREEN}Available Trading Symbols ({len(symbols)} total):")
             print("-" * 50)
             
-            # Display symbols in columns
-            for i in range(0, len(symbols), 4):
-                row_symbols = symbols[i:i+4]
-                print("  ".join(f"{s:<12}" for s in row_symbols))
-            
-            print()
+            # Display symbols in columns with a single write
+            padded = [f"{s:<12}" for s in symbols]
+            rows = ["  ".join(padded[i:i+4]) for i in range(0, len(padded), 4)]
+            sys.stdout.write("\n".join(rows) + "\n\n")
             
         except Exception as e:
             print(f"{Fore.RED}❌ Error getting symbols: {str(e)}")
@@ -278,39 +294,13 @@ class TradingBotCLI:
                     if cmd in ['quit', 'exit']:
                         print(f"{Fore.YELLOW}👋 Goodbye!")
                         break
-                    elif cmd == 'help':
-                        self.handle_help()
-                    elif cmd == 'info':
-                        self.handle_info(args)
-                    elif cmd == 'positions':
-                        self.handle_positions(args)
-                    elif cmd == 'orders':
-                        self.handle_orders(args)
-                    elif cmd == 'price':
-                        self.handle_price(args)
-                    elif cmd == 'buy_market':
-                        self.handle_buy_market(args)
-                    elif cmd == 'sell_market':
-                        self.handle_sell_market(args)
-                    elif cmd == 'buy_limit':
-                        self.handle_buy_limit(args)
-                    elif cmd == 'sell_limit':
-                        self.handle_sell_limit(args)
-                    elif cmd == 'cancel':
-                        self.handle_cancel(args)
-                    elif cmd == 'history':
-                        self.handle_history(args)
-                    elif cmd == 'symbols':
-                        self.handle_symbols(args)
-                    elif cmd == 'performance':
-                        self.handle_performance(args)
-                    elif cmd == 'start':
-                        self.handle_start(args)
-                    elif cmd == 'stop':
-                        self.handle_stop(args)
-                    else:
+                    
+                    handler = self._handlers.get(cmd)
+                    if handler is None:
                         print(f"{Fore.RED}❌ Unknown command: {cmd}")
                         print(f"{Fore.YELLOW}Type 'help' to see available commands.")
+                    else:
+                        handler(args)
                 
                 except KeyboardInterrupt:
                     print(f"\n{Fore.YELLOW}👋 Goodbye!")
@@ -15,9 +15,24 @@ class Config:
     BINANCE_API_KEY = os.getenv('BINANCE_API_KEY', '')
     BINANCE_SECRET_KEY = os.getenv('BINANCE_SECRET_KEY', '')
     
+    # HTTP Connection Pool Configuration
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '64'))
+    
+    # Market Data Stream Configuration
+    MARKET_DATA_STREAM = os.getenv('MARKET_DATA_STREAM', 'true').lower() == 'true'
+    MARKET_DATA_MAX_AGE = float(os.getenv('MARKET_DATA_MAX_AGE', '5'))
+    MARKET_DATA_MARK_PRICES = os.getenv('MARKET_DATA_MARK_PRICES', 'true').lower() == 'true'
+    MARKET_DATA_START_TIMEOUT = float(os.getenv('MARKET_DATA_START_TIMEOUT', '10'))
+    
+    # Exchange Info Cache Configuration
+    EXCHANGE_INFO_TTL = float(os.getenv('EXCHANGE_INFO_TTL', '3600'))
+    EXCHANGE_INFO_MISS_TTL = float(os.getenv('EXCHANGE_INFO_MISS_TTL', '60'))
+    
     # Trading Configuration
     DEFAULT_SYMBOL = os.getenv('DEFAULT_SYMBOL', 'BTCUSDT')
     DEFAULT_QUANTITY = float(os.getenv('DEFAULT_QUANTITY', '0.001'))
+    ORDER_RATE_LIMIT = float(os.getenv('ORDER_RATE_LIMIT', '10'))
+    METRICS_RING_SIZE = int(os.getenv('METRICS_RING_SIZE', '1024'))
     
     # Logging Configuration
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
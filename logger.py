@@ -1,8 +1,13 @@
 """
 Logging configuration for the Trading Bot
 """
+import atexit
+import functools
 import logging
+import logging.handlers
 import os
+import queue
+import orjson
 from datetime import datetime
 from config import Config
 
@@ -34,7 +39,21 @@ def setup_logger():
     file_handler = logging.FileHandler(Config.LOG_FILE)
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(detailed_formatter)
-    logger.addHandler(file_handler)
+    
+    # Hand file records to a background listener so callers only enqueue;
+    # the listener writes each record as it arrives, so nothing waits in
+    # memory to be lost on a crash
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(logging.DEBUG)
+    logger.addHandler(queue_handler)
+    
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    # Drain the queue on exit
+    atexit.register(listener.stop)
     
     # Console handler for user-friendly output
     console_handler = logging.StreamHandler()
@@ -49,17 +68,19 @@ def log_api_request(method: str, endpoint: str, params: dict = None, response: d
     logger = logging.getLogger('trading_bot.api')
     
     # Log request
-    logger.info(f"API Request: {method} {endpoint}")
-    if params:
+    logger.info("API Request: %s %s", method, endpoint)
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if params and debug_enabled:
         # Mask sensitive information
         safe_params = {k: v for k, v in params.items() 
                       if k.lower() not in ['api_key', 'secret', 'signature']}
-        logger.debug(f"Request params: {safe_params}")
+        logger.debug("Request params: %s", safe_params)
     
     # Log response
     if response:
-        logger.info(f"API Response: {response.get('status', 'unknown')}")
-        logger.debug(f"Response data: {response}")
+        logger.info("API Response: %s", response.get('status', 'unknown'))
+        if debug_enabled:
+            logger.debug("Response data: %s", orjson.dumps(response, default=str).decode())
 
 def log_trade_action(action: str, symbol: str, side: str, quantity: float, 
                     price: float = None, order_id: str = None):
@@ -79,7 +100,23 @@ def log_error(error: Exception, context: str = ""):
     logger = logging.getLogger('trading_bot.errors')
     
     message = f"ERROR in {context}: {str(error)}"
-    logger.error(message, exc_info=True)
+    logger.error(message, exc_info=error)
+
+def log_errors(method):
+    """
+    Decorator that logs an exception raised by a method and re-raises it
+    
+    The error context names the method and its arguments, e.g.
+    "get_current_price(BTCUSDT)".
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except Exception as e:
+            log_error(e, f"{method.__name__}({', '.join(map(str, args))})")
+            raise
+    return wrapper
 
 def log_performance_metrics(metrics: dict):
     """Log performance metrics"""
@@ -89,5 +126,13 @@ def log_performance_metrics(metrics: dict):
     for key, value in metrics.items():
         logger.info(f"  {key}: {value}")
 
+def log_performance_records(records):
+    """Log sampled (total, successful, failed) trade count records, oldest first"""
+    logger = logging.getLogger('trading_bot.performance')
+    
+    logger.info("PERFORMANCE RECORDS:")
+    for total, successful, failed in records:
+        logger.info("  total=%s successful=%s failed=%s", total, successful, failed)
+
 # Initialize logger when module is imported
 main_logger = setup_logger()
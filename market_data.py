@@ -0,0 +1,182 @@
+"""
+Market Data Stream
+Keeps an in-memory price cache fed by Binance Futures WebSocket streams
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+from binance import ThreadedWebsocketManager
+from config import Config
+
+class MarketDataStream:
+    """
+    Streams prices into a local cache
+    
+    Subscribed symbols get best bid/ask updates from their book ticker stream;
+    every symbol also gets its mark price from the all-market mark price
+    stream, which serves as a fallback when no book ticker update is fresh.
+    """
+    
+    def __init__(self):
+        """Initialize the market data stream"""
+        self.logger = logging.getLogger(__name__)
+        self.latest_price: Dict[str, float] = {}
+        self._updated_at: Dict[str, float] = {}
+        self.mark_price: Dict[str, float] = {}
+        self._mark_updated_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # Book ticker symbols, all carried by one multiplexed socket
+        self._symbols: List[str] = []
+        self._book_socket: Optional[str] = None
+        # Held while the socket is swapped, separate from the price lock so
+        # updates keep flowing meanwhile
+        self._subscribe_lock = threading.Lock()
+        self._manager = None
+    
+    @property
+    def running(self) -> bool:
+        """Whether the websocket manager thread is alive"""
+        return self._manager is not None and self._manager.is_alive()
+    
+    def start(self):
+        """
+        Start the websocket manager thread
+        
+        Raises:
+            RuntimeError: If the manager is not ready to open sockets within
+                Config.MARKET_DATA_START_TIMEOUT seconds
+        """
+        if self.running:
+            return
+        
+        self._manager = ThreadedWebsocketManager(
+            api_key=Config.BINANCE_API_KEY,
+            api_secret=Config.BINANCE_SECRET_KEY,
+            testnet=True
+        )
+        # Never keep the interpreter alive just for market data
+        self._manager.daemon = True
+        self._manager.start()
+        self._wait_until_ready(Config.MARKET_DATA_START_TIMEOUT)
+        
+        if Config.MARKET_DATA_MARK_PRICES:
+            self._manager.start_all_mark_price_socket(
+                callback=self._handle_mark_prices,
+                fast=True
+            )
+        
+        self.logger.info("Market data stream started")
+    
+    def _wait_until_ready(self, timeout: float):
+        """
+        Wait for the manager thread to connect its client
+        
+        Opening a socket before then would block until it connects, which is
+        forever if it never does.
+        """
+        deadline = time.monotonic() + timeout
+        while self._manager._bsm is None:
+            if not self._manager.is_alive():
+                error = "Websocket manager thread exited before connecting"
+            elif time.monotonic() > deadline:
+                error = f"Websocket manager not ready after {timeout:g}s"
+            else:
+                time.sleep(0.1)
+                continue
+            
+            self._manager.stop()
+            self._manager = None
+            raise RuntimeError(error)
+    
+    def stop(self):
+        """Stop all streams and the websocket manager thread"""
+        if self._manager is None:
+            return
+        
+        with self._subscribe_lock:
+            self._manager.stop()
+            self._manager = None
+            self._symbols.clear()
+            self._book_socket = None
+        
+        with self._lock:
+            self.latest_price.clear()
+            self._updated_at.clear()
+            self.mark_price.clear()
+            self._mark_updated_at.clear()
+        
+        self.logger.info("Market data stream stopped")
+    
+    def subscribe(self, symbol: str):
+        """
+        Add a symbol to the book ticker stream
+        
+        All subscribed symbols share one multiplexed socket, which is
+        reopened with the new stream list whenever a symbol is added.
+        """
+        with self._subscribe_lock:
+            if not self.running or symbol in self._symbols:
+                return
+            
+            self._symbols.append(symbol)
+            if self._book_socket is not None:
+                self._manager.stop_socket(self._book_socket)
+            
+            self._book_socket = self._manager.start_futures_multiplex_socket(
+                callback=self._handle_book_ticker,
+                streams=[f"{s.lower()}@bookTicker" for s in self._symbols]
+            )
+            self.logger.info("Subscribed to %s@bookTicker", symbol.lower())
+    
+    def get_price(self, symbol: str) -> Optional[float]:
+        """
+        Get the cached price for a symbol
+        
+        Prefers the book ticker mid price and falls back to the mark price.
+        Returns None when neither has been updated within
+        Config.MARKET_DATA_MAX_AGE seconds.
+        """
+        oldest = time.monotonic() - Config.MARKET_DATA_MAX_AGE
+        
+        with self._lock:
+            if self._updated_at.get(symbol, 0.0) >= oldest:
+                return self.latest_price[symbol]
+            if self._mark_updated_at.get(symbol, 0.0) >= oldest:
+                return self.mark_price[symbol]
+        
+        return None
+    
+    def _handle_book_ticker(self, msg: Dict):
+        """Store the mid price from a book ticker update"""
+        data = msg.get('data', msg)
+        
+        if data.get('e') == 'error':
+            self.logger.warning("Market data stream error: %s", data.get('m'))
+            return
+        
+        try:
+            mid_price = (float(data['b']) + float(data['a'])) / 2
+        except (KeyError, TypeError, ValueError):
+            return
+        
+        with self._lock:
+            self.latest_price[data['s']] = mid_price
+            self._updated_at[data['s']] = time.monotonic()
+    
+    def _handle_mark_prices(self, msg):
+        """Store the mark prices from an all-market mark price update"""
+        # Updates arrive wrapped in the combined stream envelope, with a list
+        # of per-symbol prices as the data; errors are reported as a dict
+        data = msg.get('data', msg) if isinstance(msg, dict) else msg
+        
+        if isinstance(data, dict):
+            if data.get('e') == 'error':
+                self.logger.warning("Mark price stream error: %s", data.get('m'))
+            return
+        
+        now = time.monotonic()
+        with self._lock:
+            for update in data:
+                self.mark_price[update['s']] = float(update['p'])
+                self._mark_updated_at[update['s']] = now
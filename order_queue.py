@@ -0,0 +1,131 @@
+"""
+Rate-Limited Order Queue
+Coalesces order submissions into batches that respect the exchange order rate limit
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate"""
+    
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full bucket
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens the bucket holds
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated_at = time.monotonic()
+    
+    def refill(self) -> float:
+        """Add the tokens accrued since the last refill and return the balance"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        return self.tokens
+    
+    def take(self, count: int):
+        """Spend tokens"""
+        self.tokens -= count
+    
+    def time_until(self, count: int = 1) -> float:
+        """Seconds until count tokens are available"""
+        return max(0.0, (count - self.tokens) / self.rate)
+
+class OrderQueue:
+    """Queues order specs and submits them in rate-limited concurrent batches"""
+    
+    def __init__(self, submit: Callable[[Dict], Awaitable[Dict]], rate: float):
+        """
+        Initialize the queue
+        
+        Args:
+            submit: Coroutine function that places one order spec
+            rate: Maximum orders submitted per second
+        """
+        self.logger = logging.getLogger(__name__)
+        self._submit = submit
+        # Created on first submit so it binds to the loop that runs the worker
+        self._queue: Optional[asyncio.Queue] = None
+        self._bucket = TokenBucket(rate, rate)
+        self._worker: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+    
+    async def submit(self, spec: Dict) -> Dict:
+        """Queue an order spec and wait for its exchange response"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        
+        if self._worker is None or self._worker.done():
+            if self._worker is not None and not self._worker.cancelled():
+                self.logger.error("Order queue worker died, restarting: %s", self._worker.exception())
+            self._worker = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((spec, future))
+        return await future
+    
+    async def stop(self):
+        """Stop the worker and fail any orders still waiting in the queue"""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        
+        while self._queue is not None and not self._queue.empty():
+            self._fail_unsent([self._queue.get_nowait()])
+        
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+    
+    async def _run(self):
+        """Drain the queue, sending as many orders per batch as there are tokens"""
+        while True:
+            batch = [await self._queue.get()]
+            
+            if self._bucket.refill() < 1:
+                try:
+                    await asyncio.sleep(self._bucket.time_until(1))
+                except asyncio.CancelledError:
+                    self._fail_unsent(batch)
+                    raise
+                self._bucket.refill()
+            
+            while len(batch) < int(self._bucket.tokens) and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            self._bucket.take(len(batch))
+            self.logger.debug("Submitting batch of %s orders", len(batch))
+            
+            # Don't wait for responses before draining the next batch
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+    
+    async def _dispatch(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        """Submit a batch concurrently and resolve each waiting future"""
+        results = await asyncio.gather(
+            *(self._submit(spec) for spec, _ in batch),
+            return_exceptions=True
+        )
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    @staticmethod
+    def _fail_unsent(batch: List[Tuple[Dict, asyncio.Future]]):
+        """Fail the futures of orders that were never submitted"""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("Order queue stopped before submission"))
@@ -2,33 +2,281 @@
 Main Trading Bot Class
 Orchestrates all trading operations and provides the main interface
 """
+import array
+import asyncio
+import itertools
 import logging
-from typing import Dict, List, Optional, Tuple
+import struct
+import sys
+import threading
+import time
+from typing import ClassVar, Dict, Iterator, List, Optional, Tuple
+from binance.exceptions import BinanceAPIException, BinanceRequestException
 from binance_client import BinanceFuturesClient
-from logger import log_trade_action, log_error, log_performance_metrics
+from async_client import BinanceFuturesAsyncClient, EventLoopThread
+from order_queue import OrderQueue
+from market_data import MarketDataStream
+from logger import (log_trade_action, log_error, log_errors, log_performance_metrics,
+                    log_performance_records)
 from config import Config
 
+# Table rules, built once instead of on every display call
+_SEP40, _SEP50, _SEP80, _SEP100 = "="*40, "="*50, "="*80, "="*100
+_DASH80, _DASH100 = "-"*80, "-"*100
+
+# Binary metrics sample: total, successful and failed trade counts
+_METRICS_FMT = struct.Struct("<QQQ")
+
+# Column headers and their minimum widths for the position and open order tables
+_POS_COLUMNS = (('Symbol', 12), ('Side', 6), ('Size', 15), ('Entry Price', 12),
+                ('Mark Price', 12), ('PnL', 12))
+_ORD_COLUMNS = (('Order ID', 12), ('Symbol', 12), ('Side', 6), ('Type', 12),
+                ('Quantity', 15), ('Price', 12), ('Status', 12))
+
+def _format_table(columns: Tuple[Tuple[str, int], ...], rows: List[Tuple[str, ...]]) -> List[str]:
+    """
+    Lay out a table as text lines, header first
+    
+    Each column is as wide as its widest cell, but never narrower than its
+    minimum width, so long symbols widen the table instead of breaking it.
+    """
+    headers = tuple(name for name, _ in columns)
+    widths = [max(minimum, *map(len, cells))
+              for (_, minimum), cells in zip(columns, zip(headers, *rows))]
+    # One printf-style format per table lays out a whole row in a single call
+    row_fmt = " ".join("%%-%ds" % width for width in widths)
+    return [row_fmt % row for row in (headers, *rows)]
+
+class BotResources:
+    """
+    Connections and background services a TradingBot trades through
+    
+    Bots trading through the same BinanceFuturesClient (see TradingBot.shared)
+    hold the same instance, so they share the REST client, the market data
+    stream, the async client with its event loop, and the order queue (and so
+    one order rate limit). Trade counters, the account snapshot and the
+    running flag stay per bot.
+    
+    The stream and the async client are started by the first bot that needs
+    them and stopped once the last bot using them lets go.
+    """
+    
+    def __init__(self, client: Optional[BinanceFuturesClient] = None):
+        """
+        Initialize the resources
+        
+        Args:
+            client: Existing client to trade through; a new one is created if omitted
+        """
+        self.logger = logging.getLogger(__name__)
+        self.client = client if client is not None else BinanceFuturesClient()
+        self.market_data: Optional[MarketDataStream] = None
+        
+        # Async client and the loop it lives on, created on first bulk request
+        self.async_loop: Optional[EventLoopThread] = None
+        self.async_client: Optional[BinanceFuturesAsyncClient] = None
+        self.order_queue: Optional[OrderQueue] = None
+        
+        self._market_data_users = 0
+        self._async_users = 0
+        self._lock = threading.Lock()
+    
+    def acquire_market_data(self):
+        """Register a market data user, starting the stream for the first one"""
+        with self._lock:
+            self._market_data_users += 1
+            if self.market_data is not None:
+                return
+        
+        # Connecting can take seconds, so start the stream without holding
+        # the lock and publish it afterwards
+        stream = MarketDataStream()
+        try:
+            stream.start()
+            stream.subscribe(Config.DEFAULT_SYMBOL)
+        except Exception as e:
+            log_error(e, "start_market_data")
+            self.logger.warning("Market data stream unavailable, using REST prices")
+            stream.stop()
+            return
+        
+        with self._lock:
+            if self.market_data is None and self._market_data_users:
+                self.market_data = stream
+                self.client.market_data = stream
+                return
+        
+        # Another user published a stream first, or every user has let go
+        stream.stop()
+    
+    def release_market_data(self):
+        """Unregister a market data user, stopping the stream after the last one"""
+        with self._lock:
+            self._market_data_users -= 1
+            if self._market_data_users or self.market_data is None:
+                return
+            
+            stream = self.market_data
+            self.client.market_data = None
+            self.market_data = None
+        
+        stream.stop()
+    
+    def acquire_async_client(self) -> BinanceFuturesAsyncClient:
+        """Register an async client user, creating the client and its loop for the first one"""
+        with self._lock:
+            if self.async_client is None:
+                self.async_loop = EventLoopThread()
+                try:
+                    self.async_client = self.async_loop.run(BinanceFuturesAsyncClient.create())
+                    self.order_queue = OrderQueue(self._submit_order_async, Config.ORDER_RATE_LIMIT)
+                except Exception:
+                    self.async_loop.stop()
+                    self.async_loop = None
+                    raise
+            self._async_users += 1
+            return self.async_client
+    
+    def release_async_client(self):
+        """Unregister an async client user, closing the client after the last one"""
+        with self._lock:
+            self._async_users -= 1
+            if self._async_users or self.async_client is None:
+                return
+            
+            try:
+                self.async_loop.run(self.order_queue.stop())
+                self.async_loop.run(self.async_client.close())
+            finally:
+                self.async_loop.stop()
+                self.async_loop = None
+                self.async_client = None
+                self.order_queue = None
+    
+    async def _submit_order_async(self, spec: Dict) -> Dict:
+        """Place a single market or limit order described by spec"""
+        if spec.get('price'):
+            return await self.async_client.place_limit_order(spec['symbol'], spec['side'],
+                                                             spec['quantity'], spec['price'])
+        return await self.async_client.place_market_order(spec['symbol'], spec['side'],
+                                                          spec['quantity'])
+
 class TradingBot:
     """Main trading bot class"""
     
-    def __init__(self):
-        """Initialize the trading bot"""
+    # Default client of shared(), and the resources of every client that
+    # bots have been given, so bots on one client share one set
+    _shared_client: ClassVar[Optional[BinanceFuturesClient]] = None
+    _resources_by_client: ClassVar[Dict[BinanceFuturesClient, BotResources]] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+    
+    def __init__(self, client: Optional[BinanceFuturesClient] = None):
+        """
+        Initialize the trading bot
+        
+        Args:
+            client: Existing client to trade through, shared with every other
+                bot given the same client; a private one is created if omitted
+        """
         self.logger = logging.getLogger(__name__)
-        self.client = BinanceFuturesClient()
+        self._resources = self._resources_for(client) if client is not None else BotResources()
+        self.client = self._resources.client
         self.running = False
         
-        # Performance tracking
-        self.trade_count = 0
-        self.successful_trades = 0
-        self.failed_trades = 0
+        # Whether this bot holds a reference on the shared stream / async client
+        self._uses_market_data = False
+        self._uses_async_client = False
+        self._async_lock = threading.Lock()
+        
+        # Performance tracking: total, successful and failed trade counts
+        self._stats = array.array('Q', [0, 0, 0])
+        
+        # Ring of packed metrics samples; _metrics_written counts every sample
+        # taken, so the next slot is _metrics_written % Config.METRICS_RING_SIZE
+        self._metrics_ring = bytearray(Config.METRICS_RING_SIZE * _METRICS_FMT.size)
+        self._metrics_written = 0
+        
+        # Account snapshot shared by the account and position displays
+        self._snap: Optional[Dict] = None
+        self._snap_ts = 0.0
         
         self.logger.info("Trading Bot initialized successfully")
     
+    @classmethod
+    def _resources_for(cls, client: BinanceFuturesClient) -> BotResources:
+        """Get the resources of a client, creating them for its first bot"""
+        with cls._shared_lock:
+            resources = cls._resources_by_client.get(client)
+            if resources is None:
+                resources = cls._resources_by_client[client] = BotResources(client)
+            return resources
+    
+    @classmethod
+    def shared(cls, client: Optional[BinanceFuturesClient] = None) -> 'TradingBot':
+        """
+        Create a bot that shares its client and BotResources with other bots
+        
+        All bots on one client reuse the same connection pools, exchange info
+        cache, order templates, market data stream and order rate limit
+        instead of each opening their own.
+        
+        Args:
+            client: Client to share; defaults to one created on first use
+        """
+        if client is None:
+            with cls._shared_lock:
+                if cls._shared_client is None:
+                    cls._shared_client = BinanceFuturesClient()
+                client = cls._shared_client
+        return cls(client=client)
+    
+    @property
+    def market_data(self) -> Optional[MarketDataStream]:
+        """The market data stream this bot's prices are served from, if running"""
+        return self._resources.market_data
+    
+    @property
+    def trade_count(self) -> int:
+        """Total number of trades attempted"""
+        return self._stats[0]
+    
+    @property
+    def successful_trades(self) -> int:
+        """Number of trades that were placed successfully"""
+        return self._stats[1]
+    
+    @property
+    def failed_trades(self) -> int:
+        """Number of trades that failed"""
+        return self._stats[2]
+    
+    def _record_trades(self, successful: int = 0, failed: int = 0):
+        """Add trade outcomes to the performance counters"""
+        stats = self._stats
+        stats[0] += successful + failed
+        stats[1] += successful
+        stats[2] += failed
+        
+        # Placed orders change balances and positions
+        if successful:
+            self._snap = None
+    
+    def _snapshot(self, ttl: float = 1.0) -> Dict:
+        """Get the account snapshot, refetching it once older than ttl seconds"""
+        now = time.monotonic()
+        if self._snap is None or now - self._snap_ts > ttl:
+            self._snap = self.client.get_account_snapshot()
+            self._snap_ts = now
+        return self._snap
+    
     def start(self):
         """Start the trading bot"""
         self.running = True
         self.logger.info("Trading Bot started")
         
+        if Config.MARKET_DATA_STREAM:
+            self.start_market_data()
+        
         # Display initial account info
         self.display_account_info()
     
@@ -37,23 +285,70 @@ class TradingBot:
         self.running = False
         self.logger.info("Trading Bot stopped")
         
-        # Display final performance metrics
+        self.stop_market_data()
+        self.close_async_client()
+        
+        # Display final performance metrics, plus any sampled history
         self.display_performance_metrics()
+        if self._metrics_written:
+            self.dump_performance_samples()
+    
+    def start_market_data(self):
+        """Start streaming prices so lookups are served from a local cache"""
+        if self._uses_market_data:
+            return
+        
+        self._resources.acquire_market_data()
+        self._uses_market_data = True
+    
+    def stop_market_data(self):
+        """Stop using the market data stream; it stops once no bot uses it"""
+        if not self._uses_market_data:
+            return
+        
+        self._uses_market_data = False
+        self._resources.release_market_data()
+    
+    def get_async_client(self) -> BinanceFuturesAsyncClient:
+        """Get the async client, creating it and its event loop on first use"""
+        with self._async_lock:
+            if not self._uses_async_client:
+                self._resources.acquire_async_client()
+                self._uses_async_client = True
+            return self._resources.async_client
+    
+    def close_async_client(self):
+        """Stop using the async client; it is closed once no bot uses it"""
+        with self._async_lock:
+            if not self._uses_async_client:
+                return
+            
+            self._uses_async_client = False
+            self._resources.release_async_client()
+    
+    def _emit(self, lines: List[str]):
+        """Write a block of output lines with a single write and flush"""
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     
     def display_account_info(self):
         """Display current account information"""
         try:
-            account_info = self.client.get_account_info()
-            
-            print("\n" + "="*50)
-            print("ACCOUNT INFORMATION")
-            print("="*50)
-            print(f"Total Wallet Balance: {account_info['total_wallet_balance']} USDT")
-            print(f"Available Balance: {account_info['available_balance']} USDT")
-            print(f"Total Unrealized PnL: {account_info['total_unrealized_pnl']} USDT")
-            print(f"Total Margin Balance: {account_info['total_margin_balance']} USDT")
-            print(f"Max Withdraw Amount: {account_info['max_withdraw_amount']} USDT")
-            print("="*50 + "\n")
+            account_info = self._snapshot()['account']
+            
+            self._emit([
+                "",
+                _SEP50,
+                "ACCOUNT INFORMATION",
+                _SEP50,
+                f"Total Wallet Balance: {account_info['total_wallet_balance']} USDT",
+                f"Available Balance: {account_info['available_balance']} USDT",
+                f"Total Unrealized PnL: {account_info['total_unrealized_pnl']} USDT",
+                f"Total Margin Balance: {account_info['total_margin_balance']} USDT",
+                f"Max Withdraw Amount: {account_info['max_withdraw_amount']} USDT",
+                _SEP50,
+                ""
+            ])
             
         except Exception as e:
             log_error(e, "display_account_info")
@@ -62,66 +357,73 @@ class TradingBot:
     def display_positions(self):
         """Display current positions"""
         try:
-            positions = self.client.get_positions()
+            positions = self._snapshot()['positions']
             
             if not positions:
                 print("No open positions")
                 return
             
-            print("\n" + "="*80)
-            print("CURRENT POSITIONS")
-            print("="*80)
-            print(f"{'Symbol':<12} {'Side':<6} {'Size':<15} {'Entry Price':<12} {'Mark Price':<12} {'PnL':<12}")
-            print("-"*80)
-            
+            rows = []
             for pos in positions:
                 symbol = pos['symbol']
-                side = "LONG" if float(pos['positionAmt']) > 0 else "SHORT"
-                size = abs(float(pos['positionAmt']))
-                entry_price = pos['entryPrice']
-                mark_price = pos['markPrice']
-                pnl = pos['unRealizedProfit']
+                amount = float(pos['positionAmt'])
+                side = "LONG" if amount > 0 else "SHORT"
                 
-                print(f"{symbol:<12} {side:<6} {size:<15.6f} {entry_price:<12} {mark_price:<12} {pnl:<12}")
+                # Prices and PnL keep the exchange's own precision
+                rows.append((symbol, side, "%.6f" % abs(amount), pos['entryPrice'],
+                             pos['markPrice'], pos['unRealizedProfit']))
             
-            print("="*80 + "\n")
+            header, *body = _format_table(_POS_COLUMNS, rows)
+            lines = ["", _SEP80, "CURRENT POSITIONS", _SEP80, header, _DASH80]
+            lines.extend(body)
+            lines.extend([_SEP80, ""])
+            self._emit(lines)
             
         except Exception as e:
             log_error(e, "display_positions")
             print(f"Error getting positions: {str(e)}")
     
     def display_open_orders(self, symbol: Optional[str] = None):
-        """Display open orders"""
+        """Display open orders, only those for symbol if one is given"""
+        if symbol:
+            self.display_symbol_open_orders(symbol)
+        else:
+            self.display_all_open_orders()
+    
+    def display_all_open_orders(self):
+        """Display open orders across all symbols"""
         try:
-            orders = self.client.get_open_orders(symbol)
-            
-            if not orders:
-                print(f"No open orders{' for ' + symbol if symbol else ''}")
-                return
-            
-            print(f"\n{'='*100}")
-            print(f"OPEN ORDERS{' for ' + symbol if symbol else ''}")
-            print(f"{'='*100}")
-            print(f"{'Order ID':<12} {'Symbol':<12} {'Side':<6} {'Type':<12} {'Quantity':<15} {'Price':<12} {'Status':<12}")
-            print("-"*100)
-            
-            for order in orders:
-                order_id = str(order['orderId'])
-                symbol = order['symbol']
-                side = order['side']
-                order_type = order['type']
-                quantity = order['origQty']
-                price = order.get('price', 'Market')
-                status = order['status']
-                
-                print(f"{order_id:<12} {symbol:<12} {side:<6} {order_type:<12} {quantity:<15} {price:<12} {status:<12}")
-            
-            print("="*100 + "\n")
-            
+            self._render_open_orders(self.client.get_open_orders(), "")
         except Exception as e:
-            log_error(e, "display_open_orders")
+            log_error(e, "display_all_open_orders")
             print(f"Error getting open orders: {str(e)}")
     
+    def display_symbol_open_orders(self, symbol: str):
+        """Display open orders for a single symbol"""
+        try:
+            self._render_open_orders(self.client.get_open_orders(symbol), f" for {symbol}")
+        except Exception as e:
+            log_error(e, f"display_symbol_open_orders({symbol})")
+            print(f"Error getting open orders: {str(e)}")
+    
+    def _render_open_orders(self, orders: List[Dict], suffix: str):
+        """Print an open order table, with suffix appended to its title"""
+        if not orders:
+            print(f"No open orders{suffix}")
+            return
+        
+        rows = [
+            (str(order['orderId']), order['symbol'], order['side'], order['type'],
+             order['origQty'], order.get('price', 'Market'), order['status'])
+            for order in orders
+        ]
+        
+        header, *body = _format_table(_ORD_COLUMNS, rows)
+        lines = ["", _SEP100, f"OPEN ORDERS{suffix}", _SEP100, header, _DASH100]
+        lines.extend(body)
+        lines.extend([_SEP100, ""])
+        self._emit(lines)
+    
     def place_market_order(self, symbol: str, side: str, quantity: float) -> bool:
         """Place a market order"""
         try:
@@ -132,8 +434,7 @@ class TradingBot:
             log_trade_action("MARKET_ORDER", symbol, side, quantity, 
                            order_id=str(order['orderId']))
             
-            self.trade_count += 1
-            self.successful_trades += 1
+            self._record_trades(successful=1)
             
             print(f"✅ Market {side} order placed successfully!")
             print(f"   Order ID: {order['orderId']}")
@@ -145,8 +446,7 @@ class TradingBot:
             
         except Exception as e:
             log_error(e, f"place_market_order({symbol}, {side}, {quantity})")
-            self.trade_count += 1
-            self.failed_trades += 1
+            self._record_trades(failed=1)
             
             print(f"❌ Failed to place market {side} order: {str(e)}")
             return False
@@ -162,8 +462,7 @@ class TradingBot:
             log_trade_action("LIMIT_ORDER", symbol, side, quantity, price, 
                            str(order['orderId']))
             
-            self.trade_count += 1
-            self.successful_trades += 1
+            self._record_trades(successful=1)
             
             print(f"✅ Limit {side} order placed successfully!")
             print(f"   Order ID: {order['orderId']}")
@@ -176,18 +475,56 @@ class TradingBot:
             
         except Exception as e:
             log_error(e, f"place_limit_order({symbol}, {side}, {quantity}, {price})")
-            self.trade_count += 1
-            self.failed_trades += 1
+            self._record_trades(failed=1)
             
             print(f"❌ Failed to place limit {side} order: {str(e)}")
             return False
     
+    def place_orders_bulk(self, orders: List[Dict]) -> List:
+        """
+        Place several orders concurrently
+        
+        Args:
+            orders: Order specs with 'symbol', 'side' and 'quantity', plus
+                'price' for limit orders
+        
+        Returns:
+            The order response, or the exception raised, for each spec
+        """
+        self.get_async_client()
+        results = self._resources.async_loop.run(self._place_orders_bulk_async(orders))
+        
+        successful = 0
+        for spec, result in zip(orders, results):
+            if isinstance(result, Exception):
+                log_error(result, f"place_orders_bulk({spec})")
+                print(f"❌ Failed to place {spec['side']} order for {spec['symbol']}: {str(result)}")
+            else:
+                successful += 1
+                log_trade_action("LIMIT_ORDER" if spec.get('price') else "MARKET_ORDER",
+                               spec['symbol'], spec['side'], spec['quantity'],
+                               spec.get('price'), str(result['orderId']))
+                print(f"✅ {result['type']} {spec['side']} order {result['orderId']} "
+                      f"placed for {spec['symbol']} ({result['status']})")
+        
+        self._record_trades(successful=successful, failed=len(results) - successful)
+        
+        return results
+    
+    async def _place_orders_bulk_async(self, orders: List[Dict]) -> List:
+        """Queue all order specs for rate-limited submission and wait for every response"""
+        return await asyncio.gather(
+            *(self._resources.order_queue.submit(spec) for spec in orders),
+            return_exceptions=True
+        )
+    
     def cancel_order(self, symbol: str, order_id: int) -> bool:
         """Cancel an order"""
         try:
             self.logger.info(f"Cancelling order {order_id} for {symbol}")
             
             result = self.client.cancel_order(symbol, order_id)
+            self._snap = None
             
             print(f"✅ Order {order_id} cancelled successfully!")
             print(f"   Symbol: {symbol}")
@@ -200,52 +537,89 @@ class TradingBot:
             print(f"❌ Failed to cancel order {order_id}: {str(e)}")
             return False
     
+    @log_errors
     def get_current_price(self, symbol: str) -> float:
         """Get current price for a symbol"""
-        try:
-            price = self.client.get_current_price(symbol)
-            return price
-        except Exception as e:
-            log_error(e, f"get_current_price({symbol})")
-            raise
+        return self.client.get_current_price(symbol)
+    
+    def sample_performance_metrics(self):
+        """
+        Record the trade counters into the metrics ring
+        
+        Packs one fixed-size record in place, overwriting the oldest sample
+        once the ring is full, so monitoring loops can call it every tick
+        without allocating.
+        """
+        slot = self._metrics_written % Config.METRICS_RING_SIZE
+        _METRICS_FMT.pack_into(self._metrics_ring, slot * _METRICS_FMT.size, *self._stats)
+        self._metrics_written += 1
+    
+    @property
+    def metrics_buffer(self) -> memoryview:
+        """
+        Read-only view of the raw metrics ring
+        
+        Holds Config.METRICS_RING_SIZE little-endian (total, successful, failed)
+        uint64 records; slot metrics_written % METRICS_RING_SIZE is the next
+        to be overwritten.
+        """
+        return memoryview(self._metrics_ring).toreadonly()
+    
+    @property
+    def metrics_written(self) -> int:
+        """Number of samples recorded so far, including overwritten ones"""
+        return self._metrics_written
+    
+    def performance_samples(self) -> Iterator[Tuple[int, int, int]]:
+        """Iterate over the samples still in the ring, oldest first"""
+        size = _METRICS_FMT.size
+        slots = Config.METRICS_RING_SIZE
+        ring = memoryview(self._metrics_ring)
+        
+        if self._metrics_written <= slots:
+            return _METRICS_FMT.iter_unpack(ring[:self._metrics_written * size])
+        
+        split = (self._metrics_written % slots) * size
+        return itertools.chain(_METRICS_FMT.iter_unpack(ring[split:]),
+                               _METRICS_FMT.iter_unpack(ring[:split]))
+    
+    def dump_performance_samples(self):
+        """Log every sample still in the metrics ring"""
+        log_performance_records(self.performance_samples())
     
     def display_performance_metrics(self):
         """Display performance metrics"""
-        if self.trade_count == 0:
+        total, successful, failed = self._stats
+        
+        if total == 0:
             print("No trades executed yet.")
             return
         
-        success_rate = (self.successful_trades / self.trade_count) * 100
+        success_rate = (successful / total) * 100
         
         metrics = {
-            "Total Trades": self.trade_count,
-            "Successful Trades": self.successful_trades,
-            "Failed Trades": self.failed_trades,
+            "Total Trades": total,
+            "Successful Trades": successful,
+            "Failed Trades": failed,
             "Success Rate": f"{success_rate:.2f}%"
         }
         
         log_performance_metrics(metrics)
         
-        print("\n" + "="*40)
-        print("PERFORMANCE METRICS")
-        print("="*40)
-        for key, value in metrics.items():
-            print(f"{key}: {value}")
-        print("="*40 + "\n")
+        lines = ["", _SEP40, "PERFORMANCE METRICS", _SEP40]
+        lines.extend(f"{key}: {value}" for key, value in metrics.items())
+        lines.extend([_SEP40, ""])
+        self._emit(lines)
     
     def validate_symbol(self, symbol: str) -> bool:
         """Validate if symbol exists and is tradeable"""
         try:
-            symbol_info = self.client.get_symbol_info(symbol)
-            return symbol_info['status'] == 'TRADING'
-        except Exception as e:
+            return self.client.is_symbol_tradeable(symbol)
+        except (KeyError, ValueError, BinanceAPIException, BinanceRequestException) as e:
             self.logger.warning(f"Symbol validation failed for {symbol}: {str(e)}")
             return False
     
+    @log_errors
     def get_symbol_info(self, symbol: str) -> Dict:
         """Get detailed symbol information"""
-        try:
-            return self.client.get_symbol_info(symbol)
-        except Exception as e:
-            log_error(e, f"get_symbol_info({symbol})")
-            raise
+        return self.client.get_symbol_info(symbol)